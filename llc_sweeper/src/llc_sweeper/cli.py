@@ -1,9 +1,7 @@
 import argparse
 import sys
 from .models import LLCSpecs
-from .sweeper import sweep_design
-from .plotting import plot_gain_curves
-import matplotlib.pyplot as plt
+from .sweeper import sweep_design, get_diverse_candidates
 
 def main():
     parser = argparse.ArgumentParser(description="LLC Design Sweeper")
@@ -13,6 +11,7 @@ def main():
     parser.add_argument("--pout", type=float, help="Power Output", default=600)
     parser.add_argument("--fr", type=float, help="Target Resonant Freq (Hz)", default=100e3)
     parser.add_argument("--fsw-min", type=float, help="Min Switching Freq (Hz)", default=50e3)
+    parser.add_argument("--plot", action="store_true", help="Show gain curves of the top candidates")
     
     args = parser.parse_args()
     
@@ -47,8 +46,6 @@ def main():
         sys.exit(1)
 
     print(f"\nFound {len(results)} candidates. Top 3 (Diverse):")
-    
-    from .sweeper import get_diverse_candidates
     top_candidates = get_diverse_candidates(results, top_n=3)
     
     for i, res in enumerate(top_candidates):
@@ -65,9 +62,12 @@ def main():
         if res.warnings:
             print(f"  Warnings: {res.warnings}")
 
-    # Plot
-    # plot_gain_curves(results)
-    # plt.show() # Not in headless
+    # Plot (matplotlib imported only when requested: it is slow to import)
+    if args.plot:
+        import matplotlib.pyplot as plt
+        from .plotting import plot_gain_curves
+        plot_gain_curves(top_candidates)
+        plt.show()
 
 if __name__ == "__main__":
     main()
@@ -1,5 +1,16 @@
+import itertools
+import math
+from functools import lru_cache
 import numpy as np
 from typing import List
+from .models import StressResult
+
+# Constant factors of the stress equations (folded once at import)
+_SQRT2 = math.sqrt(2)
+_INV_SQRT2 = 1 / math.sqrt(2)
+_PI_OVER_2 = math.pi / 2
+_PI_OVER_2SQRT2 = math.pi / (2 * math.sqrt(2))
+_TWO_PI = 2 * math.pi
 
 def calculate_n(Vin: float, Vout: float) -> tuple[float, int]:
     """
@@ -26,6 +37,9 @@ def calculate_Lm_max(t_dead: float, Coss: float, fsw_min: float) -> float:
     
     The article formula is:
     LM_MAX = (t_dead * T_min) / (16 * Coss)
+    
+    Plain arithmetic: also accepts NumPy arrays. Scalar callers that repeat
+    the same specs can use the memoized _calculate_Lm_max_cached.
     """
     # Assuming f_start_up = 3 * fsw_min (typical soft start)
     # The article actually uses fsw_min in the example calculation to derive Lm_max?
@@ -40,6 +54,9 @@ def calculate_Lm_max(t_dead: float, Coss: float, fsw_min: float) -> float:
     lm_max = (t_sw_min * t_dead) / (16 * Coss)
     return lm_max
 
+# Depends on the specs only; hashable (scalar) args
+_calculate_Lm_max_cached = lru_cache(maxsize=128)(calculate_Lm_max)
+
 def calculate_required_deadtime(Lm: float, Coss: float, fsw_min: float) -> float:
     """
     Calculate minimum required deadtime for ZVS with given Lm.
@@ -52,13 +69,16 @@ def calculate_required_deadtime(Lm: float, Coss: float, fsw_min: float) -> float
     return t_dead_req
 
 def calculate_tank_components(
-    Vout: float, Pout: float, n: int, fR: float, Ln: float, Qe: float
-) -> tuple[float, float, float, float, float]:
+    Vout: float, Pout: float, n: int, fR: float,
+    Ln: float | np.ndarray, Qe: float | np.ndarray
+) -> tuple[float, np.ndarray, np.ndarray, np.ndarray, float]:
     """
     Step 5: Resonant tank selection.
+    Ln and Qe may be scalars or broadcastable arrays (e.g. a whole flattened
+    (Ln, Qe) grid); Cr, Lr, Lm then come back with the broadcast shape.
     
     Returns:
-        Re, Cr, Lr, Lm, Rl
+        Re, Cr, Lr, Lm, Rl  (Re and Rl are scalars: independent of Ln, Qe)
     """
     # Eq (6)
     Rl = (Vout**2) / Pout
@@ -77,8 +97,6 @@ def calculate_tank_components(
     
     return Re, Cr, Lr, Lm, Rl
 
-    return Re, Cr, Lr, Lm, Rl
-
 def get_rounded_neighbors(
     Lr: float, Cr: float, Lm: float, 
     L_step: float = 1.0e-6, C_step: float = 1.0e-9
@@ -100,10 +118,45 @@ def get_rounded_neighbors(
     Cr_opts = get_opts(Cr, C_step)
     Lm_opts = get_opts(Lm, L_step)
     
-    import itertools
     combinations = list(itertools.product(Lr_opts, Cr_opts, Lm_opts))
     return combinations
 
+def get_rounded_neighbors_vec(
+    Lr: np.ndarray, Cr: np.ndarray, Lm: np.ndarray,
+    L_step: float = 1.0e-6, C_step: float = 1.0e-9
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized get_rounded_neighbors over arrays of N ideal designs.
+    Returns:
+        combos: (N, 8, 3) array of (Lr_new, Cr_new, Lm_new), in the same
+                order as itertools.product(Lr_opts, Cr_opts, Lm_opts)
+        valid:  (N, 8) bool mask; False where floor == ceil makes the
+                combination a duplicate, or where a floor rounds a component
+                down to zero (no tank to evaluate)
+    """
+    def get_opts(val, step):
+        d = np.asarray(val, dtype=float) / step
+        lower = np.floor(d)
+        upper = np.ceil(d)
+        opts = np.stack([lower, upper], axis=-1) * step
+        has_upper = np.stack([np.ones_like(d, dtype=bool), upper != lower], axis=-1)
+        return opts, has_upper
+
+    Lr_opts, Lr_ok = get_opts(Lr, L_step)
+    Cr_opts, Cr_ok = get_opts(Cr, C_step)
+    Lm_opts, Lm_ok = get_opts(Lm, L_step)
+    
+    N = Lr_opts.shape[0]
+    shape = (N, 2, 2, 2)
+    combos = np.stack([
+        np.broadcast_to(Lr_opts[:, :, None, None], shape),
+        np.broadcast_to(Cr_opts[:, None, :, None], shape),
+        np.broadcast_to(Lm_opts[:, None, None, :], shape),
+    ], axis=-1).reshape(N, 8, 3)
+    valid = (Lr_ok[:, :, None, None] & Cr_ok[:, None, :, None] & Lm_ok[:, None, None, :]).reshape(N, 8)
+    valid &= np.all(combos > 0, axis=-1)
+    return combos, valid
+
 def recalculate_params(Lr: float, Cr: float, Re: float) -> tuple[float, float]:
     """
     Step 6: Recalculation after component selection.
@@ -123,12 +176,104 @@ def gain_fha(fN: float, Ln: float, Qe: float) -> float:
     Step 7: Tank transfer function (M_gain).
     Eq (14):
     M = 1 / sqrt( (1 + 1/Ln * (1 - 1/fN^2))^2 + Qe^2 * (fN - 1/fN)^2 )
+    
+    Written with a shared 1/fN and no power operations so array sweeps over
+    (designs x fN) allocate as few temporaries as possible.
     """
-    term1 = (1 + (1/Ln) * (1 - 1/(fN**2)))**2
-    term2 = (Qe**2) * (fN - 1/fN)**2
-    gain = 1 / np.sqrt(term1 + term2)
+    inv_fN = 1 / fN
+    A = 1 + (1 - inv_fN * inv_fN) / Ln
+    B = Qe * (fN - inv_fN)
+    gain = 1 / np.sqrt(A * A + B * B)
     return gain
 
+def gain_fha_grid(fN: np.ndarray, Ln: np.ndarray, Qe: np.ndarray) -> np.ndarray:
+    """
+    gain_fha on a (designs x fN) grid, partially evaluated.
+    Eq (14) separates into fN-only terms (1 - 1/fN^2, (fN - 1/fN)^2) and
+    design-only terms (1/Ln, Qe^2). Those are computed once on the 1-D inputs,
+    then combined in place on a single (len(Ln), len(fN)) buffer.
+    """
+    fN = np.asarray(fN, dtype=float)
+    inv_fN = 1 / fN
+    u = 1 - inv_fN * inv_fN
+    w = fN - inv_fN
+    w *= w
+    
+    inv_Ln = 1 / np.asarray(Ln, dtype=float)
+    Qe2 = np.asarray(Qe, dtype=float) ** 2
+    
+    M = np.multiply.outer(inv_Ln, u)   # (1/Ln) * (1 - 1/fN^2)
+    M += 1
+    M *= M                              # A^2
+    M += np.multiply.outer(Qe2, w)      # + B^2
+    np.sqrt(M, out=M)
+    np.reciprocal(M, out=M)
+    return M
+
+def gain_fha_dfN(fN: float, Ln: float, Qe: float) -> float:
+    """
+    Analytic derivative dM/dfN of Eq (14), used for Newton refinement.
+    With A = 1 + 1/Ln * (1 - 1/fN^2) and B = Qe * (fN - 1/fN):
+    dM/dfN = -(A * dA + B * dB) * M^3
+    """
+    inv_fN = 1 / fN
+    inv_fN2 = inv_fN * inv_fN
+    A = 1 + (1 - inv_fN2) / Ln
+    B = Qe * (fN - inv_fN)
+    dA = 2 * inv_fN2 * inv_fN / Ln
+    dB = Qe * (1 + inv_fN2)
+    M = 1 / np.sqrt(A * A + B * B)
+    return -(A * dA + B * dB) * M**3
+
+def solve_fN_cubic(
+    target_gain: float, Ln: np.ndarray, Qe: np.ndarray,
+    fN_min: float, fN_max: float
+) -> np.ndarray:
+    """
+    Closed-form inverse of Eq (14): fN such that M(fN, Ln, Qe) = target_gain.
+    With x = fN^2 and a0 = 1 + 1/Ln, M^2 = 1 / (A^2 + B^2) becomes the cubic
+    Qe^2 x^3 + (a0^2 - 2 Qe^2 - 1/M^2) x^2 + (Qe^2 - 2 a0/Ln) x + 1/Ln^2 = 0
+    (both sides are positive, so squaring adds no spurious roots).
+    All designs are solved at once via batched companion-matrix eigenvalues.
+
+    Returns the real root in [fN_min, fN_max] closest to resonance (fN=1),
+    NaN where there is none (or Qe = 0, where the cubic degenerates).
+    """
+    Ln = np.asarray(Ln, dtype=float)
+    Qe2 = np.asarray(Qe, dtype=float) ** 2
+    Ln, Qe2 = np.broadcast_arrays(Ln, Qe2)
+    inv_Ln = 1 / Ln
+    a0 = 1 + inv_Ln
+
+    # Monic cubic x^3 + p x^2 + q x + r
+    with np.errstate(divide='ignore', invalid='ignore'):
+        inv_lead = 1 / Qe2
+        p = (a0 * a0 - 2 * Qe2 - 1 / (target_gain * target_gain)) * inv_lead
+        q = (Qe2 - 2 * a0 * inv_Ln) * inv_lead
+        r = inv_Ln * inv_Ln * inv_lead
+    ok = np.isfinite(p) & np.isfinite(q) & np.isfinite(r)
+
+    comp = np.zeros(Ln.shape + (3, 3))
+    comp[..., 0, 0] = np.where(ok, -p, 0)
+    comp[..., 0, 1] = np.where(ok, -q, 0)
+    comp[..., 0, 2] = np.where(ok, -r, 0)
+    comp[..., 1, 0] = 1
+    comp[..., 2, 1] = 1
+    x = np.linalg.eigvals(comp)
+
+    # Real roots only (a double root may come back with a tiny imaginary part)
+    real = np.abs(x.imag) <= 1e-9 * np.maximum(1.0, np.abs(x.real))
+    x = x.real
+    in_range = real & (x >= fN_min * fN_min) & (x <= fN_max * fN_max) & ok[..., None]
+    fN = np.sqrt(np.where(in_range, x, np.nan))
+
+    # Pick the in-range root closest to fN=1 (the inductive branch when boosting;
+    # above resonance there is a single root)
+    dist = np.where(in_range, np.abs(fN - 1), np.inf)
+    pick = np.argmin(dist, axis=-1)
+    fN = np.take_along_axis(fN, pick[..., None], axis=-1)[..., 0]
+    return fN
+
 def required_gain(Vin: float, Vout: float, n: int) -> float:
     """
     Eq (16): Required gain to achieve Vout.
@@ -140,7 +285,7 @@ def required_gain(Vin: float, Vout: float, n: int) -> float:
 def calculate_stress_full(
     Vin: float, Vout: float, Pout: float, n: int, 
     Lm: float, Lr: float, Cr: float, fsw: float
-) -> dict:
+) -> StressResult:
     """
     Implements Eqs (19) - (28).
     """
@@ -148,7 +293,7 @@ def calculate_stress_full(
     
     # Eq (19) Peak Magnetizing Current
     Ilm_peak = (n * Vout) / (4 * fsw * Lm)
-    Ilm_rms = Ilm_peak / np.sqrt(2) # FHA Sinusoidal Approximation
+    Ilm_rms = Ilm_peak * _INV_SQRT2 # FHA Sinusoidal Approximation
     
     # Eq (20) Primary Resonant Current RMS
     # Vector sum of Magnetizing RMS (Inductive) and Reflected Load RMS (Resistive)
@@ -163,38 +308,37 @@ def calculate_stress_full(
     # Let's use the standard analytical FHA form:
     # I_load_rms_pri = (np.pi / (2 * np.sqrt(2))) * (Iout / n)
     # This matches commonly accepted FHA.
-    I_load_rms_pri = (np.pi * Iout) / (2 * np.sqrt(2) * n)
+    I_load_rms_pri = _PI_OVER_2SQRT2 * Iout / n
     
     Ilr_rms = np.sqrt(Ilm_rms**2 + I_load_rms_pri**2)
     
     # Eq (21) Peak Primary Current
-    Ilr_peak = np.sqrt(2) * Ilr_rms
+    Ilr_peak = _SQRT2 * Ilr_rms
     
     # Eq (22) Resonant Capacitor Voltage
     # VCR (AC RMS) = ILR_RMS / (2 * pi * fsw * Cr)
-    Vcr_rms = Ilr_rms / (2 * np.pi * fsw * Cr)
+    Vcr_rms = Ilr_rms / (_TWO_PI * fsw * Cr)
     
     # Physical Peak Voltage (DC Bias + AC Peak)
-    Vcr_peak = (Vin / 2) + (np.sqrt(2) * Vcr_rms)
+    Vcr_peak = (Vin / 2) + (_SQRT2 * Vcr_rms)
     
     # Secondary Currents (Rectified Sine approximation)
-    Id_peak = (Iout * np.pi) / 2
+    Id_peak = Iout * _PI_OVER_2
     Id_rms = Id_peak / 2 
     
     # Primary Switch Currents
     Iq_peak = Ilr_peak
-    Iq_rms = Ilr_rms / np.sqrt(2)
-    
-    return {
-        "Ilm_peak": Ilm_peak,
-        "Ilm_rms": Ilm_rms,
-        "Ilr_rms": Ilr_rms,
-        "Ilr_peak": Ilr_peak,
-        "Vcr_peak": Vcr_peak,
-        "Vcr_rms": Vcr_rms, # Added for completeness
-        "Iq_rms": Iq_rms,
-        "Iq_peak": Iq_peak,
-        "Id_rms": Id_rms,
-        "Id_peak": Id_peak
-    }
-
+    Iq_rms = Ilr_rms * _INV_SQRT2
+    
+    return StressResult(
+        Ilm_peak=Ilm_peak,
+        Ilm_rms=Ilm_rms,
+        Ilr_rms=Ilr_rms,
+        Ilr_peak=Ilr_peak,
+        Vcr_peak=Vcr_peak,
+        Vcr_rms=Vcr_rms, # Added for completeness
+        Iq_rms=Iq_rms,
+        Iq_peak=Iq_peak,
+        Id_rms=Id_rms,
+        Id_peak=Id_peak
+    )
@@ -25,22 +25,13 @@ def is_openmagnetics_available() -> bool:
     return OPENMAGNETICS_AVAILABLE
 
 
-def design_transformer_openmagnetics(
-    specs: Any, # Typed as LLCSpecs but avoiding circle import if possible, or use explicit type
-    res: Any,   # Typed as SimulationResult
-    corner: str = "full_load"
-) -> Dict[str, Any]:
+def _empty_result() -> Dict[str, Any]:
     """
-    Propose transformer designs using OpenMagnetics.
-    
-    Inputs:
-    - n_used (Turn ratio)
-    - Lm_real (Magnetizing Inductance)
-    - fsw (Switching Frequency)
-    - Waveforms (Approximated)
+    Fresh adapter result in the 'fail' state (shared by all design functions).
+    Built per call: the nested lists/dict are mutated by callers, so a shared
+    module-level template would leak state between calls.
     """
-    
-    result = {
+    return {
         "status": "fail",
         "top_designs": [],
         "chosen": None,
@@ -56,6 +47,24 @@ def design_transformer_openmagnetics(
         }
     }
 
+
+def design_transformer_openmagnetics(
+    specs: Any, # Typed as LLCSpecs but avoiding circle import if possible, or use explicit type
+    res: Any,   # Typed as SimulationResult
+    corner: str = "full_load"
+) -> Dict[str, Any]:
+    """
+    Propose transformer designs using OpenMagnetics.
+    
+    Inputs:
+    - n_used (Turn ratio)
+    - Lm_real (Magnetizing Inductance)
+    - fsw (Switching Frequency)
+    - Waveforms (Approximated)
+    """
+    
+    result = _empty_result()
+
     if not OPENMAGNETICS_AVAILABLE:
         result["errors"].append("OpenMagnetics not installed.")
         return result
@@ -102,21 +111,7 @@ def design_resonant_inductor_openmagnetics(
     - fsw
     - Current (RMS/Peak)
     """
-    result = {
-        "status": "fail",
-        "top_designs": [],
-        "chosen": None,
-        "warnings": [],
-        "errors": [],
-        "metrics": {
-             "total_loss_W": 0.0,
-             "core_loss_W": 0.0,
-             "copper_loss_W": 0.0,
-             "estimated_temp_rise_C": 0.0,
-             "fill_factor": 0.0,
-             "volume_cm3": 0.0
-        }
-    }
+    result = _empty_result()
 
     if not OPENMAGNETICS_AVAILABLE:
         result["errors"].append("OpenMagnetics not installed.")
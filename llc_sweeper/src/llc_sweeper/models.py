@@ -1,12 +1,13 @@
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import List, NamedTuple, Optional
 import numpy as np
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class LLCSpecs:
     """
     Input specifications for the LLC Converter.
     Units: Volts, Watts, Hz, Farads, Henrys, seconds.
+    Immutable: derive variants with dataclasses.replace.
     """
     Vin: float       # Input voltage (V)
     Vout: float      # Output voltage (V)
@@ -33,7 +34,7 @@ class LLCSpecs:
     def Iout(self) -> float:
         return self.Pout / self.Vout
 
-@dataclass
+@dataclass(slots=True)
 class LLCTank:
     """
     Designed tank parameters.
@@ -59,7 +60,7 @@ class LLCTank:
     Cr_ideal: float = 0.0
     Lm_ideal: float = 0.0
 
-@dataclass
+@dataclass(slots=True)
 class SimulationResult:
     """
     Simulation results for a specific operating point.
@@ -102,3 +103,18 @@ class SimulationResult:
     valid: bool = True
     warnings: List[str] = field(default_factory=list)
 
+class StressResult(NamedTuple):
+    """
+    Component stresses from calculate_stress_full (Eqs 19-28).
+    Fields are floats, or arrays when evaluated over a whole sweep.
+    """
+    Ilm_peak: float
+    Ilm_rms: float
+    Ilr_rms: float
+    Ilr_peak: float
+    Vcr_peak: float # DC + AC Peak
+    Vcr_rms: float  # AC RMS (Article Eq 22)
+    Iq_rms: float
+    Iq_peak: float
+    Id_rms: float
+    Id_peak: float
@@ -12,9 +12,13 @@ def plot_gain_curves(candidates: List[SimulationResult], top_n: int = 3, ylim: t
     
     fN_range = np.linspace(0.4, 2.5, 500)
     
-    for i, res in enumerate(candidates[:top_n]):
-        gain_curve = gain_fha(fN_range, res.tank.Ln_real, res.tank.Qe_real)
-        
+    # All curves in one broadcast: (top_n, 500)
+    shown = candidates[:top_n]
+    Ln_vec = np.array([res.tank.Ln_real for res in shown])
+    Qe_vec = np.array([res.tank.Qe_real for res in shown])
+    gain_curves = gain_fha(fN_range[None, :], Ln_vec[:, None], Qe_vec[:, None])
+    
+    for i, (res, gain_curve) in enumerate(zip(shown, gain_curves)):
         label = (f"#{i+1}: Ln={res.tank.Ln_real:.2f}, Qe={res.tank.Qe_real:.3f}, "
                  f"fN={res.fN:.2f}")
         plt.plot(fN_range, gain_curve, label=label)
@@ -1,65 +1,115 @@
+from dataclasses import replace
 import numpy as np
-from scipy.optimize import brentq
 from typing import List, Optional, Tuple
 from .models import LLCSpecs, LLCTank, SimulationResult
+from .validation import validate_batch
 from .equations import (
-    calculate_n, calculate_tank_components, recalculate_params, 
-    gain_fha, required_gain, calculate_stress_full
+    calculate_n, calculate_tank_components, get_rounded_neighbors_vec,
+    recalculate_params, gain_fha, gain_fha_grid, gain_fha_dfN, solve_fN_cubic,
+    required_gain, calculate_stress_full
 )
 
 def solve_fN(
     target_gain: float, Ln: float, Qe: float, 
     SearchRange: Tuple[float, float] = (0.3, 3.0),
-    max_gain_error: float = 0.02
+    max_gain_error: float = 0.02,
+    scan_fallback: bool = True
 ) -> Optional[float]:
     """
-    Robust solver for fN.
-    Strategy:
-    1. Determine smart range based on target gain.
-    2. Try brentq if sign change exists.
-    3. Fallback to linear scan if brentq fails.
+    Robust solver for fN (single design).
+    Thin wrapper over solve_fN_vec so scalar and sweep paths share one solver
+    (no per-iteration Python callbacks as with scipy's brentq).
+    
+    Returns:
+        fN, or None if no solution within max_gain_error.
     """
+    fN, _ = solve_fN_vec(
+        target_gain, np.array([Ln]), np.array([Qe]),
+        SearchRange=SearchRange, max_gain_error=max_gain_error,
+        scan_fallback=scan_fallback
+    )
+    fN = fN[0]
     
-    # Define error function
-    def err_func(f):
-        return gain_fha(f, Ln, Qe) - target_gain
+    if np.isnan(fN):
+        return None
+    
+    return float(fN)
 
-    # Smart Range Selection
-    # If Gain < 1: Operation is usually above resonance (Region 2)
-    # If Gain > 1: Operation is usually below resonance (Region 1)
+def solve_fN_vec(
+    target_gain: float, Ln: np.ndarray, Qe: np.ndarray,
+    SearchRange: Tuple[float, float] = (0.3, 3.0),
+    max_gain_error: float = 0.02,
+    n_grid: int = 500,
+    newton_steps: int = 3,
+    scan_fallback: bool = True
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized solver for fN over arrays of designs sharing one target gain.
+    Strategy:
+    1. Same smart range as solve_fN (target gain is common to all designs).
+    2. Closed-form root of Eq (14) as a cubic in fN^2 (solve_fN_cubic).
+    3. Designs with no root in range (target gain not reachable): pick the
+       closest point of a fixed fN grid and refine it with Newton steps.
+    
+    scan_fallback: if True (default), designs whose gain curve never crosses
+    the target in range still return the closest grid point when it is within
+    max_gain_error (near-miss). If False they are rejected (NaN) right away.
+    
+    Returns:
+        fN, gain: arrays (same length as Ln/Qe), gain being gain_fha at the
+        returned fN (already evaluated by the solver); NaN where no solution.
+    """
+    Ln = np.asarray(Ln, dtype=float)
+    Qe = np.asarray(Qe, dtype=float)
+    
     if abs(target_gain - 1.0) < 0.01: # Relaxed tolerance for "at resonance"
-        return 1.0
+        return np.ones_like(Ln), np.ones_like(Ln) # M(1, Ln, Qe) = 1
         
     if target_gain < 1.0:
         # Above resonance
         r_min = max(1.000001, SearchRange[0])
-        r_max = max(2.5, SearchRange[1]) # Reasonable upper bound
+        r_max = max(2.5, SearchRange[1])
     else:
         # Below resonance (Boost)
         r_min = max(0.4, SearchRange[0])
         r_max = min(0.999999, SearchRange[1])
+    
+    fN = solve_fN_cubic(target_gain, Ln, Qe, r_min, r_max)
+    gain = gain_fha(fN, Ln, Qe)
+    miss = np.flatnonzero(np.isnan(fN))
+    if not scan_fallback or len(miss) == 0:
+        return fN, gain
         
-    # Attempt Brentq
-    try:
-        val_min = err_func(r_min)
-        val_max = err_func(r_max)
-        if val_min * val_max < 0:
-            fN_sol = brentq(err_func, r_min, r_max)
-            return fN_sol
-    except:
-        pass # Fallback
-        
-    # Fallback: Linear Scan
-    # Scan closely around the range.
-    f_scan = np.linspace(r_min, r_max, 300)
-    errors = np.abs(gain_fha(f_scan, Ln, Qe) - target_gain)
-    idx_min = np.argmin(errors)
-    min_err = errors[idx_min]
+    # Near-miss pass: (misses, n_grid) gain matrix
+    Ln_m, Qe_m = Ln[miss], Qe[miss]
+    f_grid = np.linspace(r_min, r_max, n_grid)
+    M = gain_fha_grid(f_grid, Ln_m, Qe_m)
+    idx = np.argmin(np.abs(M - target_gain), axis=1)
+    fN_m = f_grid[idx]
+    gain_m = M[np.arange(len(idx)), idx]
+    err = np.abs(gain_m - target_gain)
     
-    if min_err < max_gain_error:
-        return f_scan[idx_min]
+    # Newton refinement, confined to the neighbouring grid cells
+    f_lo = f_grid[np.maximum(idx - 1, 0)]
+    f_hi = f_grid[np.minimum(idx + 1, n_grid - 1)]
+    f_new = fN_m.copy()
+    for _ in range(newton_steps):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            step = (gain_fha(f_new, Ln_m, Qe_m) - target_gain) / gain_fha_dfN(f_new, Ln_m, Qe_m)
+        f_new = np.clip(f_new - np.nan_to_num(step), f_lo, f_hi)
+    gain_new = gain_fha(f_new, Ln_m, Qe_m)
+    err_new = np.abs(gain_new - target_gain)
     
-    return None
+    # Keep the refined point only where it improves on the grid point
+    better = err_new < err
+    fN_m = np.where(better, f_new, fN_m)
+    gain_m = np.where(better, gain_new, gain_m)
+    err = np.where(better, err_new, err)
+    
+    solved = err < max_gain_error
+    fN[miss] = np.where(solved, fN_m, np.nan)
+    gain[miss] = np.where(solved, gain_m, np.nan)
+    return fN, gain
 
 def calculate_score(res: SimulationResult) -> float:
     """
@@ -67,6 +117,19 @@ def calculate_score(res: SimulationResult) -> float:
     Minimize: ILR_RMS, VCR_PEAK, Deviation from Resonance.
     Weights: w1=1.0, w2=1.0, w3=0.2
     """
+    # Magnetics Penalty (P2.1)
+    mag_penalty = res.magnetics_penalty if res.magnetics_penalty is not None else 0.0
+    
+    return _score_terms(
+        res.Ilr_rms, res.Vcr_peak, res.fN, res.specs.Vin,
+        len(res.warnings), mag_penalty
+    )
+
+def _score_terms(Ilr_rms, Vcr_peak, fN, Vin: float, n_warnings, mag_penalty=0.0):
+    """
+    calculate_score on plain values, so the sweep can score all designs as
+    arrays before building any result objects.
+    """
     # Reference values for normalization (Avoid zero div)
     # Using reasonably expected values for a 500W-1kW converter:
     # ILR ~ 2-5A. VCR ~ 400-600V.
@@ -75,34 +138,131 @@ def calculate_score(res: SimulationResult) -> float:
     # The prompt suggests: "median of all valid candidates" or article values.
     # For MVP we use fixed plausible refs to keep it stateless per-candidate calculation.
     ILR_REF = 3.0 
-    VCR_REF = res.specs.Vin # e.g. 400V
+    VCR_REF = Vin # e.g. 400V
     
     w1 = 1.0
     w2 = 1.0
     w3 = 0.2
     
-    term1 = w1 * (res.Ilr_rms / ILR_REF)
-    term2 = w2 * (res.Vcr_peak / VCR_REF)
-    term3 = w3 * abs(res.fN - 1.0)
+    term1 = w1 * (Ilr_rms / ILR_REF)
+    term2 = w2 * (Vcr_peak / VCR_REF)
+    term3 = w3 * np.abs(fN - 1.0)
     
     # Penalty for warnings (Soft constraint)
-    penalty = 10.0 * len(res.warnings)
-    
-    # Magnetics Penalty (P2.1)
-    mag_penalty = res.magnetics_penalty if res.magnetics_penalty is not None else 0.0
+    penalty = 10.0 * n_warnings
     
     return term1 + term2 + term3 + penalty + mag_penalty
 
-def sweep_design(specs: LLCSpecs) -> List[SimulationResult]:
+def _evaluate_designs(
+    specs: LLCSpecs, n_used: int,
+    Lr: np.ndarray, Cr: np.ndarray, Lm: np.ndarray, Re: float
+) -> dict:
+    """
+    Array kernel of the sweep: evaluates N rounded designs at once.
+    Inputs are flat arrays of length N (real components) and the ideal Re.
+    Designs with no nominal operating point are dropped right after the
+    first solve, so corner solves and stresses only run on the survivors.
+    Returns a dict of arrays over the survivors (plus scalar G_req), with
+    "index" giving their positions in the inputs; no Python objects are
+    built here, sweep_design packages the results afterwards.
+    """
+    # Recalculate parameters based on REAL components
+    fR_real, Qe_real = recalculate_params(Lr, Cr, Re)
+    Ln_real = Lm / Lr
+    
+    # Required Gain
+    G_req = required_gain(specs.Vin, specs.Vout, n_used)
+    
+    # Solve Operating Point
+    # gain is the actual gain at fN (only differs from the target for near-misses)
+    fN, gain = solve_fN_vec(G_req, Ln_real, Qe_real)
+    
+    # Pre-filter: unsolvable designs are discarded by the sweep anyway
+    index = np.flatnonzero(~np.isnan(fN))
+    if len(index) < len(fN):
+        Lr, Cr, Lm = Lr[index], Cr[index], Lm[index]
+        fR_real, Qe_real, Ln_real = fR_real[index], Qe_real[index], Ln_real[index]
+        fN, gain = fN[index], gain[index]
+    fsw = fN * fR_real
+    
+    # --- Frequency Span Check ---
+    # A) fsw_min_corner at (Vin_min, 100% Load)
+    # Same (Ln, Qe) as the nominal solve: reuse it when the target gain matches
+    # (e.g. Vin_min not given, so Vin_min == Vin).
+    G_req_min = required_gain(specs.Vin_min, specs.Vout, n_used)
+    if G_req_min == G_req:
+        fN_min = fN
+    else:
+        fN_min, _ = solve_fN_vec(G_req_min, Ln_real, Qe_real)
+    
+    # B) fsw_max_corner at (Vin_max, Light Load)
+    # Qe_light depends on load ratio. R_load increases by factor (1/ratio).
+    # Q = sqrt(Lr/Cr)/R.  Q_light = Q_nom * ratio.
+    Qe_light = Qe_real * specs.light_load_ratio
+    G_req_max = required_gain(specs.Vin_max, specs.Vout, n_used)
+    fN_max, _ = solve_fN_vec(G_req_max, Ln_real, Qe_light)
+    
+    # Soft Fail (corner unsolvable): span = 5.0 (max penalty), corners = fsw (placeholder)
+    corner_ok = ~np.isnan(fN_min) & ~np.isnan(fN_max)
+    fsw_min_corner = np.where(corner_ok, fN_min * fR_real, fsw)
+    fsw_max_corner = np.where(corner_ok, fN_max * fR_real, fsw)
+    fsw_min_corner = np.where(corner_ok & (fsw_min_corner < 1e-9), 1.0, fsw_min_corner)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        span_ratio = np.where(corner_ok, fsw_max_corner / fsw_min_corner, 5.0)
+    
+    # Penalty Rule (Span Ratio)
+    SPAN_RATIO_ALLOWED = specs.span_ratio_allowed
+    w_span = 0.6
+    # If soft fail (5.0), penalty will be large (5.0 - 1.6)*0.6 ~= 2.0
+    span_penalty = w_span * np.maximum(0, span_ratio - SPAN_RATIO_ALLOWED)
+    
+    # Check Absolute Limits (Hard penalty)
+    over_fsw_max = np.zeros_like(corner_ok)
+    if specs.fsw_max_limit is not None:
+        over_fsw_max = fsw_max_corner > specs.fsw_max_limit
+    under_fsw_min = np.zeros_like(corner_ok)
+    if specs.fsw_min is not None:
+        under_fsw_min = fsw_min_corner < specs.fsw_min
+    span_penalty = span_penalty + 5.0 * over_fsw_max + 5.0 * under_fsw_min
+    
+    # Stress
+    stress = calculate_stress_full(
+        specs.Vin, specs.Vout, specs.Pout, n_used,
+        Lm, Lr, Cr, fsw
+    )
+    
+    return {
+        "index": index,
+        "G_req": G_req,
+        "fR_real": fR_real,
+        "Qe_real": Qe_real,
+        "Ln_real": Ln_real,
+        "fN": fN,
+        "fsw": fsw,
+        "gain": gain,
+        "corner_ok": corner_ok,
+        "fsw_min_corner": fsw_min_corner,
+        "fsw_max_corner": fsw_max_corner,
+        "span_ratio": span_ratio,
+        "span_penalty": span_penalty,
+        "over_fsw_max": over_fsw_max,
+        "under_fsw_min": under_fsw_min,
+        "stress": stress
+    }
+
+def sweep_design(specs: LLCSpecs, max_results: Optional[int] = None) -> List[SimulationResult]:
     """
     Main sweep function.
+    
+    max_results: if given, only the best max_results designs are packaged
+    into results (scores are ranked as an array first), so time and memory
+    stay O(K) instead of O(N) result objects.
     """
     # 1. Basics
     n_float, n_used = calculate_n(specs.Vin, specs.Vout)
     
     # 2. Grid
-    Ln_vals = np.linspace(specs.Ln_min, specs.Ln_max, num=int((specs.Ln_max-specs.Ln_min)*2 + 1)) # e.g. 4, 4.5... or just integers if num small. 
-    # Article suggests 4 to 10. Let's do step 0.5? 
+    # Article suggests 4 to 10.
     # Prompt: "Ln [4..10] step configurable"
     Ln_vals = np.arange(specs.Ln_min, specs.Ln_max + 0.1, 1.0) # Step 1.0 for MVP
     
@@ -110,169 +270,189 @@ def sweep_design(specs: LLCSpecs) -> List[SimulationResult]:
     
     results = []
 
-    # Default Vin range if not provided
-    if specs.Vin_min is None: specs.Vin_min = specs.Vin
-    if specs.Vin_max is None: specs.Vin_max = specs.Vin
-    
-    for Ln in Ln_vals:
-        for Qe in Qe_vals:
-            # Design Tank (Ideal)
-            Re_ideal, Cr_ideal, Lr_ideal, Lm_ideal, Rl = calculate_tank_components(
-                specs.Vout, specs.Pout, n_used, specs.fR_target, Ln, Qe
-            )
-            
-            # --- Advanced Rounding Sweep ---
-            # Generate neighbors (floor/ceil) for Lr, Cr, Lm to find best Integer combination
-            from .equations import get_rounded_neighbors
-            
-            # User req: "No decimals" -> 1uH, 1nF steps
-            candidates = get_rounded_neighbors(Lr_ideal, Cr_ideal, Lm_ideal, L_step=1e-6, C_step=1e-9)
-            
-            for (Lr_r, Cr_r, Lm_r) in candidates:
-                # Recalculate parameters based on REAL components
-                fR_real, Qe_real = recalculate_params(Lr_r, Cr_r, Re_ideal)
-                Ln_real = Lm_r / Lr_r
-                
-                tank = LLCTank(
-                    n_float=n_float, n_used=n_used, 
-                    Ln_des=Ln, Qe_des=Qe,
-                    Lr=Lr_r, Cr=Cr_r, Lm=Lm_r,
-                    fR_real=fR_real, Qe_real=Qe_real, Ln_real=Ln_real,
-                    Lr_ideal=Lr_ideal, Cr_ideal=Cr_ideal, Lm_ideal=Lm_ideal
-                )
-                
-                # Required Gain
-                G_req = required_gain(specs.Vin, specs.Vout, n_used)
-                
-                # Solve Operating Point
-                fN = solve_fN(G_req, Ln_real, Qe_real)
-                
-                if fN is None:
-                    continue # Unsolvable design
-                
-                fsw = fN * fR_real
-                
-                # Stress
-                stress = calculate_stress_full(
-                    specs.Vin, specs.Vout, specs.Pout, n_used,
-                    Lm_r, Lr_r, Cr_r, fsw
-                )
-                
-                # Result Object
-                # --- Frequency Span Check (New Feature) ---
-                warnings_list = []
-                # A) fsw_min_corner at (Vin_min, 100% Load)
-                G_req_min = required_gain(specs.Vin_min, specs.Vout, n_used)
-                fN_min = solve_fN(G_req_min, Ln_real, Qe_real)
-                
-                # B) fsw_max_corner at (Vin_max, Light Load)
-                # Qe_light depends on load ratio. R_load increases by factor (1/ratio).
-                # Q = sqrt(Lr/Cr)/R.  Q_light = Q_nom * ratio.
-                Qe_light = Qe_real * specs.light_load_ratio
-                G_req_max = required_gain(specs.Vin_max, specs.Vout, n_used)
-                fN_max = solve_fN(G_req_max, Ln_real, Qe_light)
-                
-                if fN_min is None or fN_max is None:
-                    # Soft Fail: Cannot satisfy full range
-                    span_ratio = 5.0 # Max penalty
-                    fsw_min_val = fsw # Placeholder
-                    fsw_max_val = fsw # Placeholder
-                    warnings_list.append("Corner Unsolvable (Gain Limit)")
-                else:
-                    fsw_min_val = fN_min * fR_real
-                    fsw_max_val = fN_max * fR_real
-                    if fsw_min_val < 1e-9: fsw_min_val = 1.0 
-                    span_ratio = fsw_max_val / fsw_min_val
-                
-                # Penalty Rule (Span Ratio)
-                SPAN_RATIO_ALLOWED = specs.span_ratio_allowed
-                w_span = 0.6
-                # If soft fail (5.0), penalty will be large (5.0 - 1.6)*0.6 ~= 2.0
-                span_penalty = w_span * max(0, span_ratio - SPAN_RATIO_ALLOWED)
-                
-                # Check Absolute Limits
-                if specs.fsw_max_limit is not None and fsw_max_val > specs.fsw_max_limit:
-                    warnings_list.append(f"fsw_max > {specs.fsw_max_limit/1e3:.0f}k")
-                    span_penalty += 5.0 # Hard penalty
-                    
-                if specs.fsw_min is not None and fsw_min_val < specs.fsw_min:
-                    warnings_list.append(f"fsw_min < {specs.fsw_min/1e3:.0f}k")
-                    span_penalty += 5.0 # Hard penalty
-                
-                if span_ratio > 2.0:
-                    warnings_list.append(f"High fsw span ({span_ratio:.1f}x)")
-                
-                # Recalculate actual gain (solver might produce fN yielding close but not exact target)
-                gain_val = gain_fha(fN, Ln_real, Qe_real)
-                
-                res = SimulationResult(
-                    specs=specs, tank=tank,
-                    target_gain=G_req, fN=fN, fsw=fsw, gain=gain_val, 
-                    Ilm_peak=stress['Ilm_peak'],
-                    Ilm_rms=stress['Ilm_rms'],
-                    Ilr_rms=stress['Ilr_rms'],
-                    Ilr_peak=stress['Ilr_peak'],
-                    Vcr_peak=stress['Vcr_peak'],
-                    Vcr_rms=stress['Vcr_rms'],
-                    Iq_rms=stress['Iq_rms'],
-                    Iq_peak=stress['Iq_peak'],
-                    Id_rms=stress['Id_rms'],
-                    Id_peak=stress['Id_peak'],
-                    # Span Metrics
-                    fsw_min_corner=fsw_min_val,
-                    fsw_max_corner=fsw_max_val,
-                    fsw_span_ratio=span_ratio
-                )
-                
-                # Validate & Score
-                from .validation import validate_result
-                res.warnings = validate_result(res)
-                res.warnings.extend(warnings_list)
-                res.score = calculate_score(res) + span_penalty
-                
-                results.append(res)
-            
-    # Sort by score (lower is better)
-    # Deduplicate results? (Different starting Ln/Qe might map to same rounded components)
-    # Simple dedupe by (Lr, Cr, Lm) keeping lowest score
-    unique_map = {}
-    for r in results:
-        key = (r.tank.Lr, r.tank.Cr, r.tank.Lm)
-        if key not in unique_map or r.score < unique_map[key].score:
-             unique_map[key] = r
-    
-    final_results = list(unique_map.values())
-    final_results.sort(key=lambda x: x.score)
-    
-    return final_results
+    # Default Vin range if not provided (results carry the completed specs)
+    if specs.Vin_min is None or specs.Vin_max is None:
+        specs = replace(
+            specs,
+            Vin_min=specs.Vin if specs.Vin_min is None else specs.Vin_min,
+            Vin_max=specs.Vin if specs.Vin_max is None else specs.Vin_max
+        )
+    
+    # 3. Enumerate designs: (Ln, Qe) grid x rounded neighbors, flattened
+    Ln_grid, Qe_grid = np.meshgrid(Ln_vals, Qe_vals, indexing='ij')
+    Ln_grid = Ln_grid.ravel()
+    Qe_grid = Qe_grid.ravel()
+    
+    # Design Tank (Ideal), whole grid at once
+    Re_ideal, Cr_ideal, Lr_ideal, Lm_ideal, Rl = calculate_tank_components(
+        specs.Vout, specs.Pout, n_used, specs.fR_target, Ln_grid, Qe_grid
+    )
+    
+    # --- Advanced Rounding Sweep ---
+    # Generate neighbors (floor/ceil) for Lr, Cr, Lm to find best Integer combination
+    # User req: "No decimals" -> 1uH, 1nF steps
+    combos, valid = get_rounded_neighbors_vec(Lr_ideal, Cr_ideal, Lm_ideal, L_step=1e-6, C_step=1e-9)
+    
+    # Flatten to (M, 3) keeping grid order; cell maps each design back to its (Ln, Qe) cell
+    cell = np.nonzero(valid)[0]
+    if cell.size == 0:
+        return results
+    Lr_arr, Cr_arr, Lm_arr = combos[valid].T
+    Ln_des, Qe_des = Ln_grid[cell], Qe_grid[cell]
+    Lr_ideal, Cr_ideal, Lm_ideal = Lr_ideal[cell], Cr_ideal[cell], Lm_ideal[cell]
+    
+    # 4. Deduplicate (Different starting Ln/Qe might map to same rounded components)
+    # Identical (Lr, Cr, Lm) give identical tanks and scores, so keep the first
+    # occurrence. Keys are the integer uH/nF/uH values, one row per design.
+    keys = np.rint(np.column_stack((Lr_arr / 1e-6, Cr_arr / 1e-9, Lm_arr / 1e-6))).astype(np.int64)
+    _, first = np.unique(keys, axis=0, return_index=True)
+    uniq = np.sort(first)
+    
+    # 5. Evaluate all unique designs in one array pass
+    d = _evaluate_designs(specs, n_used, Lr_arr[uniq], Cr_arr[uniq], Lm_arr[uniq], Re_ideal)
+    stress = d['stress']
+    keep = uniq[d['index']] # Solvable designs, as indices into the flat arrays
+    
+    # Loop-invariant warning texts (depend on specs only)
+    warn_fsw_max = f"fsw_max > {specs.fsw_max_limit/1e3:.0f}k" if specs.fsw_max_limit is not None else None
+    warn_fsw_min = f"fsw_min < {specs.fsw_min/1e3:.0f}k" if specs.fsw_min is not None else None
+    
+    # Engineering checks for all kept designs at once
+    checks = validate_batch(
+        specs, Lm_arr[keep], d['Ln_real'], d['Qe_real'], d['fsw'], d['fN']
+    )
+    
+    # Scores for all kept designs (warnings = checks + sweep-level ones below)
+    n_warnings = (
+        np.fromiter((len(c) for c in checks), dtype=np.int64, count=len(checks))
+        + ~d['corner_ok'] + d['over_fsw_max'] + d['under_fsw_min']
+        + (d['span_ratio'] > 2.0)
+    )
+    scores = _score_terms(
+        stress.Ilr_rms, stress.Vcr_peak, d['fN'], specs.Vin, n_warnings
+    ) + d['span_penalty']
+    
+    # 6. Package results (serial pass over unique solvable designs only)
+    # Hoist every per-design column into a local list once: the loop then does
+    # plain list indexing (Python floats) instead of dict + array lookups.
+    Ln_des_k, Qe_des_k = Ln_des[keep].tolist(), Qe_des[keep].tolist()
+    Lr_k, Cr_k, Lm_k = Lr_arr[keep].tolist(), Cr_arr[keep].tolist(), Lm_arr[keep].tolist()
+    Lr_id_k, Cr_id_k, Lm_id_k = Lr_ideal[keep].tolist(), Cr_ideal[keep].tolist(), Lm_ideal[keep].tolist()
+    fR_k, Qe_k, Ln_k = d['fR_real'].tolist(), d['Qe_real'].tolist(), d['Ln_real'].tolist()
+    fN_k, fsw_k, gain_k = d['fN'].tolist(), d['fsw'].tolist(), d['gain'].tolist()
+    fsw_lo_k, fsw_hi_k, span_k = d['fsw_min_corner'].tolist(), d['fsw_max_corner'].tolist(), d['span_ratio'].tolist()
+    corner_ok_k, over_k, under_k = d['corner_ok'].tolist(), d['over_fsw_max'].tolist(), d['under_fsw_min'].tolist()
+    (Ilm_peak_k, Ilm_rms_k, Ilr_rms_k, Ilr_peak_k,
+     Vcr_peak_k, Vcr_rms_k, Iq_rms_k, Iq_peak_k) = (a.tolist() for a in stress[:8])
+    Id_rms, Id_peak = float(stress.Id_rms), float(stress.Id_peak) # Load-only: scalars
+    G_req = d['G_req']
+    scores_k = scores.tolist()
+    
+    # Rank by score (lower is better; stable, so ties keep sweep order) and
+    # package only the designs that will be returned
+    order = np.argsort(scores, kind='stable')
+    if max_results is not None:
+        order = order[:max_results]
+    
+    for k in order.tolist():
+        tank = LLCTank(
+            n_float=n_float, n_used=n_used, 
+            Ln_des=Ln_des_k[k], Qe_des=Qe_des_k[k],
+            Lr=Lr_k[k], Cr=Cr_k[k], Lm=Lm_k[k],
+            fR_real=fR_k[k], Qe_real=Qe_k[k], Ln_real=Ln_k[k],
+            Lr_ideal=Lr_id_k[k], Cr_ideal=Cr_id_k[k], Lm_ideal=Lm_id_k[k]
+        )
+        
+        span_ratio = span_k[k]
+        warnings_list = []
+        if not corner_ok_k[k]:
+            warnings_list.append("Corner Unsolvable (Gain Limit)")
+        if over_k[k]:
+            warnings_list.append(warn_fsw_max)
+        if under_k[k]:
+            warnings_list.append(warn_fsw_min)
+        if span_ratio > 2.0:
+            warnings_list.append(f"High fsw span ({span_ratio:.1f}x)")
+        
+        res = SimulationResult(
+            specs=specs, tank=tank,
+            target_gain=G_req, fN=fN_k[k], fsw=fsw_k[k], gain=gain_k[k], 
+            Ilm_peak=Ilm_peak_k[k],
+            Ilm_rms=Ilm_rms_k[k],
+            Ilr_rms=Ilr_rms_k[k],
+            Ilr_peak=Ilr_peak_k[k],
+            Vcr_peak=Vcr_peak_k[k],
+            Vcr_rms=Vcr_rms_k[k],
+            Iq_rms=Iq_rms_k[k],
+            Iq_peak=Iq_peak_k[k],
+            Id_rms=Id_rms,
+            Id_peak=Id_peak,
+            # Span Metrics
+            fsw_min_corner=fsw_lo_k[k],
+            fsw_max_corner=fsw_hi_k[k],
+            fsw_span_ratio=span_ratio,
+            # Validation warnings first, then the sweep-level ones
+            warnings=checks[k] + warnings_list,
+            score=scores_k[k]
+        )
+        results.append(res)
+    
+    return results
 
 def get_diverse_candidates(results: List[SimulationResult], top_n: int = 3) -> List[SimulationResult]:
     """
     Select top N candidates that are sufficiently distinct.
     Criteria: Different Ln (by >= 1.0) or different Qe (by >= 0.05).
+    
+    results must be ranked (as returned by sweep_design). Greedy in rank
+    order: each pick masks out every design too similar to it, and the next
+    pick is the best-ranked design still allowed.
     """
     if not results:
         return []
-        
-    selected = [results[0]]
     
-    for res in results[1:]:
-        if len(selected) >= top_n:
+    n = len(results)
+    Ln = np.fromiter((r.tank.Ln_des for r in results), dtype=float, count=n)
+    Qe = np.fromiter((r.tank.Qe_des for r in results), dtype=float, count=n)
+    
+    allowed = np.ones(n, dtype=bool)
+    picks = [0]
+    while len(picks) < top_n:
+        last = picks[-1]
+        # If too similar to ANY selected, skip
+        # Definition of distinct: Ln differs by >= 0.9 OR Qe differs by >= 0.03
+        allowed &= (np.abs(Ln - Ln[last]) >= 0.9) | (np.abs(Qe - Qe[last]) >= 0.03)
+        nxt = np.argmax(allowed)
+        if not allowed[nxt]:
             break
-            
-        # Check distinctness against all currently selected
-        is_distinct = True
-        for s in selected:
-            d_Ln = abs(res.tank.Ln_des - s.tank.Ln_des)
-            d_Qe = abs(res.tank.Qe_des - s.tank.Qe_des)
-            
-            # If too similar to ANY selected, skip
-            # Definition of distinct: Ln differs by >= 0.9 OR Qe differs by >= 0.03
-            if d_Ln < 0.9 and d_Qe < 0.03:
-                is_distinct = False
-                break
-        
-        if is_distinct:
-            selected.append(res)
-            
-    return selected
+        picks.append(int(nxt))
+    
+    return [results[i] for i in picks]
+
+def results_to_frame(results: List[SimulationResult]):
+    """
+    Leaderboard table of sweep results (one row per design, ranked order).
+    Columns are built straight from arrays and kept numeric, so display
+    formatting is left to the caller.
+    """
+    import pandas as pd # Only needed for tabular output
+    
+    n = len(results)
+    def col(get):
+        return np.fromiter((get(r) for r in results), dtype=float, count=n)
+    
+    return pd.DataFrame({
+        "Rank": np.arange(1, n + 1),
+        "Score": col(lambda r: r.score),
+        "Ln": col(lambda r: r.tank.Ln_real),
+        "Qe": col(lambda r: r.tank.Qe_real),
+        "Lr (uH)": col(lambda r: r.tank.Lr) * 1e6,
+        "Cr (nF)": col(lambda r: r.tank.Cr) * 1e9,
+        "Lm (uH)": col(lambda r: r.tank.Lm) * 1e6,
+        "fN": col(lambda r: r.fN),
+        "fsw (kHz)": col(lambda r: r.fsw) / 1e3,
+        "fsw Max": col(lambda r: r.fsw_max_corner) / 1e3,
+        "Span (x)": col(lambda r: r.fsw_span_ratio),
+        "Pri RMS (A)": col(lambda r: r.Ilr_rms),
+        "Warnings": [", ".join(r.warnings) if r.warnings else "OK" for r in results]
+    })
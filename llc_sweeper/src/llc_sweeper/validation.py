@@ -1,34 +1,64 @@
 from typing import List
-from .models import SimulationResult
-from .equations import calculate_Lm_max
+import numpy as np
+from .models import LLCSpecs, SimulationResult
+from .equations import _calculate_Lm_max_cached
 
-def validate_result(res: SimulationResult) -> List[str]:
+def validate_batch(
+    specs: LLCSpecs, Lm: np.ndarray, Ln_real: np.ndarray, Qe_real: np.ndarray,
+    fsw: np.ndarray, fN: np.ndarray
+) -> List[List[str]]:
     """
-    Check engineering constraints.
+    Check engineering constraints for many designs sharing one specs.
+    The checks run as NumPy masks; warning strings are only formatted for
+    the designs that actually trigger them.
+    
+    Returns one warning list per design (same order as the inputs).
     """
-    warnings = []
+    Lm = np.atleast_1d(np.asarray(Lm, dtype=float))
+    Ln_real = np.atleast_1d(np.asarray(Ln_real, dtype=float))
+    Qe_real = np.atleast_1d(np.asarray(Qe_real, dtype=float))
+    fsw = np.atleast_1d(np.asarray(fsw, dtype=float))
+    fN = np.atleast_1d(np.asarray(fN, dtype=float))
     
     # 1. ZVS Start-up Check (Eq 11)
     # Lm <= Lm_max
-    lm_max = calculate_Lm_max(res.specs.deadtime, res.specs.Coss, res.specs.fsw_min)
-    if res.tank.Lm > lm_max:
-        warnings.append(f"LM ({res.tank.Lm*1e6:.1f}uH) > LM_MAX ({lm_max*1e6:.1f}uH): No ZVS at startup")
-        
+    lm_max = _calculate_Lm_max_cached(specs.deadtime, specs.Coss, specs.fsw_min)
+    mask_lm = Lm > lm_max
+    
     # 2. Min Frequency
-    if res.fsw < res.specs.fsw_min:
-        warnings.append(f"fSW ({res.fsw/1000:.1f}kHz) < fsw_min ({res.specs.fsw_min/1000:.1f}kHz)")
-        
+    mask_fsw = fsw < specs.fsw_min
+    
     # 3. fN Range
-    if res.fN < 0.5 or res.fN > 2.5:
-         warnings.append(f"fN ({res.fN:.2f}) outside typical range [0.5, 2.5]")
-
+    mask_fN = (fN < 0.5) | (fN > 2.5)
+    
     # 4. Design Constraints Drift (Ln, Qe)
     # Allow small tolerance (e.g. 1%) for rounding drift, but warn if excessive
     tol = 0.01
-    if res.tank.Ln_real < res.specs.Ln_min * (1 - tol) or res.tank.Ln_real > res.specs.Ln_max * (1 + tol):
-        warnings.append(f"Ln_real ({res.tank.Ln_real:.2f}) out of bounds [{res.specs.Ln_min}, {res.specs.Ln_max}]")
-        
-    if res.tank.Qe_real < res.specs.Qe_min * (1 - tol) or res.tank.Qe_real > res.specs.Qe_max * (1 + tol):
-        warnings.append(f"Qe_real ({res.tank.Qe_real:.3f}) out of bounds [{res.specs.Qe_min}, {res.specs.Qe_max}]")
-         
-    return warnings
+    mask_ln = (Ln_real < specs.Ln_min * (1 - tol)) | (Ln_real > specs.Ln_max * (1 + tol))
+    mask_qe = (Qe_real < specs.Qe_min * (1 - tol)) | (Qe_real > specs.Qe_max * (1 + tol))
+    
+    any_mask = mask_lm | mask_fsw | mask_fN | mask_ln | mask_qe
+    
+    out = [[] for _ in range(len(any_mask))]
+    for i in np.flatnonzero(any_mask):
+        warnings = out[i]
+        if mask_lm[i]:
+            warnings.append(f"LM ({Lm[i]*1e6:.1f}uH) > LM_MAX ({lm_max*1e6:.1f}uH): No ZVS at startup")
+        if mask_fsw[i]:
+            warnings.append(f"fSW ({fsw[i]/1000:.1f}kHz) < fsw_min ({specs.fsw_min/1000:.1f}kHz)")
+        if mask_fN[i]:
+            warnings.append(f"fN ({fN[i]:.2f}) outside typical range [0.5, 2.5]")
+        if mask_ln[i]:
+            warnings.append(f"Ln_real ({Ln_real[i]:.2f}) out of bounds [{specs.Ln_min}, {specs.Ln_max}]")
+        if mask_qe[i]:
+            warnings.append(f"Qe_real ({Qe_real[i]:.3f}) out of bounds [{specs.Qe_min}, {specs.Qe_max}]")
+    return out
+
+def validate_result(res: SimulationResult) -> List[str]:
+    """
+    Check engineering constraints.
+    Single-result wrapper around validate_batch.
+    """
+    return validate_batch(
+        res.specs, res.tank.Lm, res.tank.Ln_real, res.tank.Qe_real, res.fsw, res.fN
+    )[0]
@@ -3,11 +3,10 @@ import pytest
 from llc_sweeper.models import LLCSpecs
 from llc_sweeper.sweeper import sweep_design
 
-def test_span_penalty_calculation():
-    """
-    Test that wide frequency span increases score via penalty.
-    """
-    # 1. Wide Specs (but realistic enough to have solutions)
+# Swept once per module and shared by the span tests below
+@pytest.fixture(scope="module")
+def wide_results():
+    # Wide Specs (but realistic enough to have solutions)
     specs = LLCSpecs(
         Vin=400.0, Vout=48.0, Pout=600.0,
         fR_target=100e3, fsw_min=50e3,
@@ -17,18 +16,11 @@ def test_span_penalty_calculation():
         # 395-405V check
         Vin_min=395.0, Vin_max=405.0
     )
-    
-    results_wide = sweep_design(specs)
-    print(f"Wide Results count: {len(results_wide)}")
-    assert len(results_wide) > 0, "No valid designs found for range 395-405V"
-    
-    res_wide = results_wide[0]
-    print(f"Wide Span Ratio: {res_wide.fsw_span_ratio:.2f}")
-    if res_wide.warnings: print(f"Wide Warnings: {res_wide.warnings}")
-    
-    assert res_wide.fsw_span_ratio > 1.0, f"Span ratio {res_wide.fsw_span_ratio} should be > 1.0"
-    
-    # 2. Narrow Specs (Basically fixed Vin)
+    return sweep_design(specs)
+
+@pytest.fixture(scope="module")
+def narrow_results():
+    # Narrow Specs (Basically fixed Vin)
     specs_narrow = LLCSpecs(
         Vin=400.0, Vout=48.0, Pout=600.0,
         fR_target=100e3, fsw_min=50e3,
@@ -38,17 +30,34 @@ def test_span_penalty_calculation():
         # Very narrow range
         Vin_min=399.9, Vin_max=400.1
     )
+    return sweep_design(specs_narrow)
+
+def test_span_penalty_calculation(wide_results, narrow_results):
+    """
+    Test that wide frequency span increases score via penalty.
+    """
+    # 1. Wide range
+    print(f"Wide Results count: {len(wide_results)}")
+    assert len(wide_results) > 0, "No valid designs found for range 395-405V"
     
-    results_narrow = sweep_design(specs_narrow)
-    print(f"Narrow Results count: {len(results_narrow)}")
-    assert len(results_narrow) > 0
+    res_wide = wide_results[0]
+    print(f"Wide Span Ratio: {res_wide.fsw_span_ratio:.2f}")
+    if res_wide.warnings: print(f"Wide Warnings: {res_wide.warnings}")
     
-    res_narrow = results_narrow[0]
+    assert res_wide.fsw_span_ratio > 1.0, f"Span ratio {res_wide.fsw_span_ratio} should be > 1.0"
+    
+    # 2. Narrow range
+    print(f"Narrow Results count: {len(narrow_results)}")
+    assert len(narrow_results) > 0
+    
+    res_narrow = narrow_results[0]
     print(f"Narrow Span Ratio: {res_narrow.fsw_span_ratio:.2f}")
     if res_narrow.warnings: print(f"Narrow Warnings: {res_narrow.warnings}")
     
     assert res_wide.fsw_span_ratio > res_narrow.fsw_span_ratio, f"Wide ({res_wide.fsw_span_ratio:.2f}) not > Narrow ({res_narrow.fsw_span_ratio:.2f})"
-    
-    # Check that fsw_max_corner (Light Load, High Vin) is indeed high
+
+def test_span_corner_ordering(wide_results):
+    """fsw_max_corner (Light Load, High Vin) sits above fsw_min_corner."""
+    res_wide = wide_results[0]
     print(f"Corner check: Min {res_wide.fsw_min_corner/1e3:.1f}k, Max {res_wide.fsw_max_corner/1e3:.1f}k")
     assert res_wide.fsw_max_corner > res_wide.fsw_min_corner